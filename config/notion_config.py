@@ -1,15 +1,24 @@
 # New file: config/notion_config.py
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
+from dotenv import load_dotenv
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class NotionConfig:
-    token: str = os.getenv('NOTION_TOKEN')
-    database_id: str = os.getenv('NOTION_DATABASE_ID')
+    token: str = field(default_factory=lambda: os.getenv('NOTION_TOKEN'))
+    database_id: str = field(default_factory=lambda: os.getenv('NOTION_DATABASE_ID'))
     
     # Webhook settings for real-time updates
-    webhook_url: str = os.getenv('WEBHOOK_URL', '')
+    webhook_url: str = field(default_factory=lambda: os.getenv('WEBHOOK_URL', ''))
     
     # Monitoring settings
     check_interval_hours: int = 6
-    max_articles_per_run: int = 50
\ No newline at end of file
+    max_articles_per_run: int = 50
+
+
+@lru_cache(maxsize=1)
+def get_notion_config() -> NotionConfig:
+    """Read the Notion settings from the environment (and .env) once per process"""
+    load_dotenv()
+    return NotionConfig()
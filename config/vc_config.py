@@ -1,3 +1,6 @@
+import itertools
+from types import MappingProxyType
+
 VC_CONFIGS = {
     "accel_india": {
         "name": "Accel India",
@@ -124,13 +127,31 @@ USER_AGENTS = [
     'Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:89.0) Gecko/20100101 Firefox/89.0'
 ]
 
+# Deterministic round-robin over USER_AGENTS; next() on a cycle is atomic under the GIL
+_UA_CYCLE = itertools.cycle(USER_AGENTS)
+
+
+def next_user_agent():
+    """Return the next user agent in rotation"""
+    return next(_UA_CYCLE)
+
+
+def _freeze(vc_config):
+    """Return a read-only view of a VC config with immutable nested values"""
+    return MappingProxyType({
+        **vc_config,
+        'search_patterns': tuple(vc_config['search_patterns']),
+        'content_selectors': MappingProxyType(dict(vc_config['content_selectors']))
+    })
+
+
+# Configs are fixed at import time; expose them read-only so they can be shared freely
+VC_CONFIGS = MappingProxyType({vc_key: _freeze(vc_config) for vc_key, vc_config in VC_CONFIGS.items()})
+
+# Each config with its key added for easier reference, built once
+_VC_CONFIG_LIST = tuple(MappingProxyType({**vc_config, 'key': vc_key}) for vc_key, vc_config in VC_CONFIGS.items())
+
 
 def load_vc_configs():
-    """Load VC configurations and return as a list of dictionaries"""
-    vc_list = []
-    for vc_key, vc_config in VC_CONFIGS.items():
-        # Add the key to the config for easier reference
-        config_with_key = vc_config.copy()
-        config_with_key['key'] = vc_key
-        vc_list.append(config_with_key)
-    return vc_list
+    """Load VC configurations and return them as a read-only tuple of mappings"""
+    return _VC_CONFIG_LIST
@@ -1,8 +1,11 @@
 # New file: src/automated_monitor.py
-import schedule
 import time
 from datetime import datetime, timedelta
 from enhanced_scraper import EnhancedMultiVCScraper
+from utils import seconds_until
+
+# Daily times at which daily_scan runs
+SCAN_TIMES = ("09:00", "17:00")
 
 class VCMonitoringService:
     def __init__(self, notion_token: str, database_id: str):
@@ -29,9 +32,7 @@ class VCMonitoringService:
         
     def start_monitoring(self):
         """Start the automated monitoring"""
-        schedule.every().day.at("09:00").do(self.daily_scan)
-        schedule.every().day.at("17:00").do(self.daily_scan)
-        
+        # Sleep straight through to the next scan time instead of polling
         while True:
-            schedule.run_pending()
-            time.sleep(3600)  # Check every hour
\ No newline at end of file
+            time.sleep(seconds_until(SCAN_TIMES))
+            self.daily_scan()
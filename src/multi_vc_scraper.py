@@ -1,54 +1,314 @@
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from requests.utils import DEFAULT_ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+import lxml.html
+from lxml import etree
+from lxml.cssselect import CSSSelector
 import csv
-import time
-import random
+import os
 import logging
+import functools
+import multiprocessing
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from itertools import chain, islice
 from urllib.parse import urljoin, urlparse
-from typing import List, Dict, Set
+from urllib.robotparser import RobotFileParser
+from typing import List, Dict, Iterable, Iterator, Optional, Set, Tuple
 import re
-from config.vc_config import VC_CONFIGS, USER_AGENTS
+from config.vc_config import VC_CONFIGS, next_user_agent
 from .notion_integration import NotionVCDatabase
-import hashlib
+from .utils import RateLimiter, declared_charset, html_parser, parse_html
+import orjson
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# (connect, read) timeouts for every scraper request
+REQUEST_TIMEOUT = (3.05, 15)
+# Article bodies are parsed incrementally and cut off past this size
+MAX_PAGE_BYTES = 5_000_000
+STREAM_CHUNK_SIZE = 64 * 1024
+# VCs whose links are discovered at the same time
+MAX_CONCURRENT_VCS = 8
+# Article fetches in flight across all VCs; each host also gets at most max_workers_per_vc
+MAX_FETCH_WORKERS = 32
+# Concurrent Notion page writes; requests are still paced by the Notion rate limiter
+NOTION_WORKERS = 4
+# Rows written to CSV between flushes while streaming results
+CSV_FLUSH_EVERY = 50
+
+@functools.lru_cache(maxsize=None)
+def _compile_patterns(search_patterns: Tuple[str, ...]) -> re.Pattern:
+    """Combine a VC's URL search patterns into one regex so each URL is scanned once"""
+    # An empty list must match nothing, like any() over no patterns
+    return re.compile('|'.join(re.escape(pattern) for pattern in search_patterns) or r'(?!)')
+
+@functools.lru_cache(maxsize=None)
+def _compile_selectors(selector_group: str) -> Tuple[CSSSelector, ...]:
+    """Compile a comma-separated selector list once, keeping its priority order"""
+    return tuple(CSSSelector(selector, translator='html') for selector in selector_group.split(', '))
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_ROBOTS_SITEMAP_RE = re.compile(r'Sitemap:\s*(.*)')
+
+@functools.lru_cache(maxsize=4096)
+def _netloc(url: str) -> str:
+    """Host part of a URL; the same links recur across listing pages of a VC"""
+    return urlparse(url).netloc
+
+# Every link target on a page, compiled once instead of walking <a> tags per page
+_HREF_XPATH = etree.XPath('//a/@href')
+
+# Fallback containers tried when a VC's own content selectors match nothing
+GENERIC_CONTENT_SELECTORS = _compile_selectors('main, article, .content, #content, .post, .entry')
+
+def _precompile_vc_configs():
+    """Compile every configured VC's URL patterns and selectors into the caches"""
+    for vc_config in VC_CONFIGS.values():
+        _compile_patterns(vc_config['search_patterns'])
+        for selector_group in vc_config['content_selectors'].values():
+            _compile_selectors(selector_group)
+
+# Done at import so worker threads and spawned parser processes only ever hit the caches
+_precompile_vc_configs()
+
+def _parse_html_stream(response: requests.Response):
+    """Build an lxml tree by feeding the body in chunks, never holding more than MAX_PAGE_BYTES"""
+    encoding = declared_charset(response)
+    parser = html_parser(encoding) if encoding else None
+    if parser is None:
+        # Detecting the encoding needs the whole body
+        return parse_html(_read_body(response))
+    
+    received = 0
+    for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+        parser.feed(chunk)
+        received += len(chunk)
+        if received >= MAX_PAGE_BYTES:
+            logger.warning(f"Truncated {response.url} after {received} bytes")
+            break
+    return parser.close()
+
+def _is_html_response(response: requests.Response) -> bool:
+    """Check the headers of a streamed response for an HTML body within MAX_PAGE_BYTES"""
+    content_type = response.headers.get('Content-Type', '')
+    if content_type and 'html' not in content_type:
+        logger.debug(f"Skipping {response.url}: Content-Type {content_type}")
+        return False
+    try:
+        content_length = int(response.headers.get('Content-Length') or 0)
+    except ValueError:
+        content_length = 0
+    if content_length > MAX_PAGE_BYTES:
+        logger.debug(f"Skipping {response.url}: Content-Length {content_length}")
+        return False
+    return True
+
+def _read_body(response: requests.Response) -> bytes:
+    """Read a streamed body, stopping once MAX_PAGE_BYTES have been received"""
+    chunks = []
+    received = 0
+    for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+        chunks.append(chunk)
+        received += len(chunk)
+        if received >= MAX_PAGE_BYTES:
+            logger.warning(f"Truncated {response.url} after {received} bytes")
+            break
+    return b''.join(chunks)
+
+def _iter_sitemap_locs(response: requests.Response) -> Iterator[str]:
+    """Stream <loc> URLs out of a sitemap, freeing each element once it has been read"""
+    # Let urllib3 undo gzip/br transfer encoding while lxml reads the raw stream
+    response.raw.decode_content = True
+    for _, loc in etree.iterparse(response.raw, tag='{*}loc', resolve_entities=False):
+        if loc.text:
+            yield loc.text.strip()
+        # Drop this entry and everything already visited so the tree never grows
+        parent = loc.getparent()
+        loc.clear()
+        while parent is not None and parent.getprevious() is not None:
+            del parent.getparent()[0]
+
+def extract_article_fields(tree, content_selectors) -> Dict[str, str]:
+    """Extract the title, content and date of a parsed page using a VC's selectors"""
+    # Extract title
+    title_elem = _select_first(tree, _compile_selectors(content_selectors['title']))
+    title = _element_text(title_elem) if title_elem is not None else ""
+    
+    # Extract content
+    content = ""
+    content_elem = _select_first(tree, _compile_selectors(content_selectors['content']))
+    if content_elem is not None:
+        content = _element_text(content_elem, separator=' ', drop_scripts=True)
+    
+    # Extract date
+    date_elem = _select_first(tree, _compile_selectors(content_selectors['date']))
+    date = _element_text(date_elem) if date_elem is not None else ""
+    
+    # If no content found, try generic selectors
+    if not content:
+        content_elem = _select_first(tree, GENERIC_CONTENT_SELECTORS)
+        if content_elem is not None:
+            content = _element_text(content_elem, separator=' ', drop_scripts=True)
+    
+    # Clean up content
+    content = _WHITESPACE_RE.sub(' ', content).strip()
+    
+    return {'title': title, 'content': content, 'date': date}
+
+def parse_article(body: bytes, content_selectors: Dict[str, str], encoding: Optional[str] = None) -> Dict[str, str]:
+    """Parse raw page bytes and extract article fields (picklable entry point for process pools)"""
+    return extract_article_fields(parse_html(body, encoding), content_selectors)
+
+def _select_first(tree, selectors: Tuple[CSSSelector, ...]):
+    """Return the first element matched by the highest-priority matching selector"""
+    for selector in selectors:
+        matches = selector(tree)
+        if matches:
+            return matches[0]
+    return None
+
+def _element_text(element, separator: str = '', drop_scripts: bool = False) -> str:
+    """Join the stripped text nodes of an element, like BeautifulSoup's get_text(strip=True)"""
+    if drop_scripts:
+        for script in element.xpath('.//script|.//style'):
+            script.drop_tree()
+    return separator.join(text.strip() for text in element.itertext() if text.strip())
+
 class MultiVCScraper:
-    def __init__(self, delay_range=(1, 3)):
+    def __init__(self, delay_range=(1, 3), max_workers_per_vc=4, parse_workers: int = None,
+                 http_cache_file: str = None):
+        # delay_range[0] is the minimum spacing between requests to the same host
         self.delay_range = delay_range
-        self.session = requests.Session()
+        self.max_workers_per_vc = max_workers_per_vc
+        self._host_limiters: Dict[str, RateLimiter] = {}
+        # Optional process pool for HTML parsing; spawn avoids forking a multi-threaded process
+        self._parse_pool = ProcessPoolExecutor(
+            max_workers=parse_workers,
+            mp_context=multiprocessing.get_context('spawn')
+        ) if parse_workers else None
+        self.session = self._build_session()
         self.scraped_urls = set()
+        # URLs currently being fetched by some worker; guarded with scraped_urls by _urls_lock
+        self._fetching_urls = set()
+        self._urls_lock = threading.Lock()
+        # ETag / Last-Modified of previously scraped articles, for conditional requests on later runs
+        self.http_cache_file = http_cache_file
+        self.http_cache: Dict[str, Dict[str, str]] = self._load_http_cache()
+        
+    def _build_session(self) -> requests.Session:
+        """Create a pooled session that keeps connections alive across requests"""
+        session = requests.Session()
+        session.headers.update(self.get_random_headers())
+        
+        # One host is fetched by max_workers_per_vc threads at a time, so they share that
+        # many warm connections; the pool does not block, so a leaked connection can never
+        # stall later requests to the host
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=self.max_workers_per_vc,
+            # Once retries run out, return the last response so its status can be inspected
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504],
+                              raise_on_status=False)
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+    
+    def _load_http_cache(self) -> Dict[str, Dict[str, str]]:
+        """Load cached validators from http_cache_file, if caching is enabled"""
+        if not self.http_cache_file or not os.path.exists(self.http_cache_file):
+            return {}
+        try:
+            with open(self.http_cache_file, 'rb') as f:
+                return orjson.loads(f.read())
+        except (OSError, orjson.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable HTTP cache {self.http_cache_file}: {e}")
+            return {}
+    
+    def save_http_cache(self):
+        """Atomically write the cached validators to http_cache_file"""
+        if not self.http_cache_file:
+            return
+        os.makedirs(os.path.dirname(self.http_cache_file) or '.', exist_ok=True)
+        with self._urls_lock:
+            data = orjson.dumps(self.http_cache)
+        tmp_file = f"{self.http_cache_file}.tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_file, self.http_cache_file)
+        logger.info(f"Saved HTTP validators for {len(self.http_cache)} URLs to {self.http_cache_file}")
+    
+    def close(self):
+        """Persist the HTTP cache and release pooled connections and parser processes"""
+        self.save_http_cache()
+        self.session.close()
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown()
         
     def get_random_headers(self) -> Dict[str, str]:
-        """Get random headers to avoid detection"""
+        """Get browser-like headers with the next rotating user agent"""
         return {
-            'User-Agent': random.choice(USER_AGENTS),
+            'User-Agent': next_user_agent(),
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
+            # Includes br when a brotli decoder is installed
+            'Accept-Encoding': DEFAULT_ACCEPT_ENCODING,
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
         }
     
-    def make_request(self, url: str) -> requests.Response:
-        """Make a request with random delay and headers"""
+    def _host_limiter(self, url: str) -> RateLimiter:
+        """Get the rate limiter for a URL's host, creating it from robots.txt on first use"""
+        parsed = urlparse(url)
+        limiter = self._host_limiters.get(parsed.netloc)
+        if limiter is None:
+            interval = max(self.delay_range[0], self._crawl_delay(f"{parsed.scheme}://{parsed.netloc}"))
+            limiter = self._host_limiters.setdefault(parsed.netloc, RateLimiter(interval))
+        return limiter
+    
+    def _crawl_delay(self, origin: str) -> float:
+        """Read the Crawl-delay a host asks for in robots.txt (0 if none)"""
+        try:
+            response = self.session.get(f"{origin}/robots.txt", timeout=REQUEST_TIMEOUT)
+            if response.ok:
+                robots = RobotFileParser()
+                robots.parse(response.text.splitlines())
+                return float(robots.crawl_delay('*') or 0)
+        except requests.RequestException as e:
+            logger.debug(f"Could not read robots.txt for {origin}: {e}")
+        return 0
+    
+    def make_request(self, url: str, stream: bool = False, headers: Dict[str, str] = None) -> requests.Response:
+        """Make a rate-limited request with rotating headers; stream=True leaves the body unread"""
         # Clean the URL first - strip whitespace and newlines
         clean_url = url.strip().replace('\n', '').replace('\r', '')
         
-        headers = self.get_random_headers()
+        # Static headers live on the session; only rotate the user agent per request
+        headers = {**(headers or {}), 'User-Agent': next_user_agent()}
+        
+        # Space out requests per host; different hosts do not wait on each other
+        limiter = self._host_limiter(clean_url)
+        limiter.wait()
         
         try:
-            response = self.session.get(clean_url, headers=headers, timeout=10)
+            response = self.session.get(clean_url, headers=headers, timeout=REQUEST_TIMEOUT, stream=stream)
             response.raise_for_status()
-            
-            # Random delay between requests
-            delay = random.uniform(*self.delay_range)
-            time.sleep(delay)
-            
+            limiter.recover()
+            logger.debug(f"Fetched {clean_url} (Content-Encoding: {response.headers.get('Content-Encoding', 'identity')})")
             return response
         except requests.RequestException as e:
+            # A streamed error body is never read; release its connection back to the pool
+            if e.response is not None:
+                e.response.close()
+            # Retries (honouring Retry-After) still ended in 429/503; slow down further requests
+            # to this host. Plain server errors (500/502/504) leave the rate alone
+            status = e.response.status_code if e.response is not None else None
+            if status in (429, 503):
+                limiter.backoff()
             logger.error(f"Error fetching {clean_url}: {e}")
             return None
     
@@ -61,25 +321,27 @@ class MultiVCScraper:
         ]
         
         relevant_links = set()
+        article_re = _compile_patterns(tuple(vc_config['search_patterns']))
         
         for sitemap_url in sitemap_urls:
             try:
-                response = self.make_request(sitemap_url)
+                is_sitemap = 'xml' in sitemap_url
+                response = self.make_request(sitemap_url, stream=is_sitemap)
                 if not response:
                     continue
                     
-                if 'xml' in sitemap_url:
-                    soup = BeautifulSoup(response.content, 'xml')
-                    urls = [loc.text.strip() for loc in soup.find_all('loc')]
+                if is_sitemap:
+                    with response:
+                        urls = list(_iter_sitemap_locs(response))
                 else:  # robots.txt
                     content = response.text
-                    sitemap_matches = re.findall(r'Sitemap:\s*(.*)', content)
+                    sitemap_matches = _ROBOTS_SITEMAP_RE.findall(content)
                     urls = [url.strip() for url in sitemap_matches]
                 
                 for url in urls:
                     # Clean URL and check patterns
                     clean_url = url.strip().replace('\n', '').replace('\r', '')
-                    if any(pattern in clean_url for pattern in vc_config['search_patterns']):
+                    if article_re.search(clean_url):
                         relevant_links.add(clean_url)
                         
             except Exception as e:
@@ -92,23 +354,30 @@ class MultiVCScraper:
     def extract_links_from_page(self, url: str, vc_config: Dict) -> Set[str]:
         """Extract relevant links from a webpage"""
         response = self.make_request(url)
-        if not response:
+        if not response or not response.content:
             return set()
         
-        soup = BeautifulSoup(response.content, 'html.parser')
+        try:
+            tree = parse_html(response.content, declared_charset(response))
+        except etree.LxmlError as e:
+            # e.g. a body of nothing but whitespace or comments
+            logger.warning(f"Could not parse {url}: {e}")
+            return set()
         links = set()
+        article_re = _compile_patterns(tuple(vc_config['search_patterns']))
+        base_netloc = _netloc(vc_config['base_url'])
         
         # Find all links on the page
-        for link in soup.find_all('a', href=True):
-            href = link['href'].strip()
+        for href in _HREF_XPATH(tree):
+            href = href.strip()
             full_url = urljoin(url, href)
             
             # Clean the URL
             clean_url = full_url.strip().replace('\n', '').replace('\r', '')
             
             # Check if link matches search patterns
-            if any(pattern in clean_url for pattern in vc_config['search_patterns']):
-                if urlparse(clean_url).netloc == urlparse(vc_config['base_url']).netloc:
+            if article_re.search(clean_url):
+                if _netloc(clean_url) == base_netloc:
                     links.add(clean_url)
         
         return links
@@ -139,58 +408,57 @@ class MultiVCScraper:
     
     def extract_content(self, url: str, vc_config: Dict) -> Dict[str, str]:
         """Extract content from a specific URL"""
-        if url in self.scraped_urls:
-            return None
-            
-        response = self.make_request(url)
+        # Claim the URL so concurrent workers (or VCs sharing a link) never fetch it twice
+        with self._urls_lock:
+            if url in self.scraped_urls or url in self._fetching_urls:
+                return None
+            self._fetching_urls.add(url)
+        
+        article = None
+        try:
+            article = self._fetch_article(url, vc_config)
+        finally:
+            with self._urls_lock:
+                self._fetching_urls.discard(url)
+                if article:
+                    self.scraped_urls.add(url)
+        return article
+    
+    def _fetch_article(self, url: str, vc_config: Dict) -> Dict[str, str]:
+        """Fetch and parse one article page, returning None if it has no usable content"""
+        response = self.make_request(url, stream=True, headers=self._conditional_headers(url))
         if not response:
             return None
         
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Extract title
-        title = ""
-        for selector in vc_config['content_selectors']['title'].split(', '):
-            title_elem = soup.select_one(selector)
-            if title_elem:
-                title = title_elem.get_text(strip=True)
-                break
-        
-        # Extract content
-        content = ""
-        for selector in vc_config['content_selectors']['content'].split(', '):
-            content_elem = soup.select_one(selector)
-            if content_elem:
-                # Remove script and style elements
-                for script in content_elem(["script", "style"]):
-                    script.decompose()
-                content = content_elem.get_text(separator=' ', strip=True)
-                break
-        
-        # Extract date
-        date = ""
-        for selector in vc_config['content_selectors']['date'].split(', '):
-            date_elem = soup.select_one(selector)
-            if date_elem:
-                date = date_elem.get_text(strip=True)
-                break
-        
-        # If no content found, try generic selectors
-        if not content:
-            generic_selectors = ['main', 'article', '.content', '#content', '.post', '.entry']
-            for selector in generic_selectors:
-                content_elem = soup.select_one(selector)
-                if content_elem:
-                    for script in content_elem(["script", "style"]):
-                        script.decompose()
-                    content = content_elem.get_text(separator=' ', strip=True)
-                    break
+        # Unchanged since it was scraped on an earlier run; nothing to download or parse
+        if response.status_code == 304:
+            response.close()
+            logger.debug(f"Not modified: {url}")
+            return None
         
-        # Clean up content
-        content = re.sub(r'\s+', ' ', content).strip()
+        # Only the headers have been read; skip PDFs, media and oversized pages before the body
+        if not _is_html_response(response):
+            response.close()
+            return None
+        
+        selectors = vc_config['content_selectors']
+        try:
+            with response:
+                if self._parse_pool is not None:
+                    # Parsing is CPU-bound; hand the raw bytes to a worker process
+                    fields = self._parse_pool.submit(
+                        parse_article, _read_body(response), dict(selectors), declared_charset(response)
+                    ).result()
+                else:
+                    fields = extract_article_fields(_parse_html_stream(response), selectors)
+        except (etree.LxmlError, requests.RequestException) as e:
+            logger.warning(f"Could not parse {url}: {e}")
+            return None
+        
+        title, content, date = fields['title'], fields['content'], fields['date']
         
         if title and content and len(content) > 100:  # Minimum content length
-            self.scraped_urls.add(url)
+            self._remember_validators(url, response)
             return {
                 'vc_name': vc_config['name'],
                 'title': title,
@@ -201,6 +469,28 @@ class MultiVCScraper:
         
         return None
     
+    def _conditional_headers(self, url: str) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since headers for a URL scraped on an earlier run"""
+        cached = self.http_cache.get(url)
+        if not cached:
+            return {}
+        headers = {}
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+        return headers
+    
+    def _remember_validators(self, url: str, response: requests.Response):
+        """Record the ETag / Last-Modified of a scraped article"""
+        if not self.http_cache_file:
+            return
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            with self._urls_lock:
+                self.http_cache[url] = {'etag': etag, 'last_modified': last_modified}
+    
     def scrape_vc(self, vc_key: str, vc_config: Dict, max_articles: int = 50) -> List[Dict[str, str]]:
         """Scrape articles for a specific VC"""
         logger.info(f"Starting to scrape {vc_config['name']}")
@@ -211,84 +501,146 @@ class MultiVCScraper:
         
         articles = []
         processed = 0
-        
-        for url in links:
-            if len(articles) >= max_articles:
-                break
-                
-            try:
-                article = self.extract_content(url, vc_config)
-                if article:
-                    articles.append(article)
-                    logger.info(f"Scraped: {article['title'][:50]}...")
+        pending = iter(links)
+        
+        # Article pages of one VC share a host, so fetch a handful at a time
+        # over the pooled session instead of one after another
+        with ThreadPoolExecutor(max_workers=self.max_workers_per_vc) as executor:
+            while len(articles) < max_articles:
+                batch = list(islice(pending, max_articles - len(articles)))
+                if not batch:
+                    break
                 
-                processed += 1
-                if processed % 10 == 0:
-                    logger.info(f"Processed {processed} URLs for {vc_config['name']}")
-                    
-            except Exception as e:
-                logger.error(f"Error processing {url}: {e}")
-                continue
+                futures = {executor.submit(self.extract_content, url, vc_config): url for url in batch}
+                for future in as_completed(futures):
+                    url = futures[future]
+                    try:
+                        article = future.result()
+                        if article:
+                            articles.append(article)
+                            logger.info(f"Scraped: {article['title'][:50]}...")
+                        
+                        processed += 1
+                        if processed % 10 == 0:
+                            logger.info(f"Processed {processed} URLs for {vc_config['name']}")
+                            
+                    except Exception as e:
+                        logger.error(f"Error processing {url}: {e}")
+                        continue
         
         logger.info(f"Successfully scraped {len(articles)} articles from {vc_config['name']}")
         return articles
     
     def scrape_all_vcs(self, vc_list: List[str] = None, max_articles_per_vc: int = 50) -> List[Dict[str, str]]:
         """Scrape articles from multiple VCs"""
+        return list(self.iter_all_vcs(vc_list, max_articles_per_vc))
+    
+    def iter_all_vcs(self, vc_list: List[str] = None, max_articles_per_vc: int = 50) -> Iterator[Dict[str, str]]:
+        """Scrape multiple VCs through one shared fetch pool, yielding articles as they are scraped"""
         if vc_list is None:
             vc_list = list(VC_CONFIGS.keys())
         
-        all_articles = []
+        discovery = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_VCS)
+        fetchers = ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS)
+        # Per-VC progress: remaining links, articles found, fetches in flight, URLs processed
+        shards: Dict[str, Dict] = {}
+        discovering = {}
+        fetching = {}
+        
+        def fill(vc_key: str):
+            # Keep each host busy up to its share of the pool without overshooting max_articles
+            shard = shards[vc_key]
+            while (shard['in_flight'] < self.max_workers_per_vc
+                   and shard['found'] + shard['in_flight'] < max_articles_per_vc):
+                url = next(shard['links'], None)
+                if url is None:
+                    break
+                fetching[fetchers.submit(self.extract_content, url, VC_CONFIGS[vc_key])] = (vc_key, url)
+                shard['in_flight'] += 1
+            if shard['in_flight'] == 0:
+                logger.info(f"Successfully scraped {shard['found']} articles from {VC_CONFIGS[vc_key]['name']}")
         
-        for vc_key in vc_list:
-            if vc_key not in VC_CONFIGS:
-                logger.warning(f"VC '{vc_key}' not found in configuration")
-                continue
-            
-            try:
-                vc_config = VC_CONFIGS[vc_key]
-                articles = self.scrape_vc(vc_key, vc_config, max_articles_per_vc)
-                all_articles.extend(articles)
-                
-                # Longer delay between VCs
-                time.sleep(random.uniform(3, 7))
+        try:
+            for vc_key in vc_list:
+                if vc_key not in VC_CONFIGS:
+                    logger.warning(f"VC '{vc_key}' not found in configuration")
+                    continue
                 
-            except Exception as e:
-                logger.error(f"Error scraping {vc_key}: {e}")
-                continue
-        
-        return all_articles
+                logger.info(f"Starting to scrape {VC_CONFIGS[vc_key]['name']}")
+                discovering[discovery.submit(self.discover_links, vc_key, VC_CONFIGS[vc_key])] = vc_key
+            
+            # Links of every VC share one queue; per-host rate limiters keep each site polite
+            while discovering or fetching:
+                done, _ = wait([*discovering, *fetching], return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future in discovering:
+                        vc_key = discovering.pop(future)
+                        vc_name = VC_CONFIGS[vc_key]['name']
+                        try:
+                            links = future.result()
+                        except Exception as e:
+                            logger.error(f"Error scraping {vc_key}: {e}")
+                            continue
+                        logger.info(f"Found {len(links)} potential articles for {vc_name}")
+                        shards[vc_key] = {'links': iter(links), 'found': 0, 'in_flight': 0, 'processed': 0}
+                        fill(vc_key)
+                        continue
+                    
+                    vc_key, url = fetching.pop(future)
+                    shard = shards[vc_key]
+                    shard['in_flight'] -= 1
+                    shard['processed'] += 1
+                    try:
+                        article = future.result()
+                    except Exception as e:
+                        logger.error(f"Error processing {url}: {e}")
+                        article = None
+                    
+                    if shard['processed'] % 10 == 0:
+                        logger.info(f"Processed {shard['processed']} URLs for {VC_CONFIGS[vc_key]['name']}")
+                    if article:
+                        shard['found'] += 1
+                        logger.info(f"Scraped: {article['title'][:50]}...")
+                        yield article
+                    fill(vc_key)
+        finally:
+            # Normally everything has finished; on early exit drop whatever is still queued
+            discovery.shutdown(wait=False, cancel_futures=True)
+            fetchers.shutdown(wait=False, cancel_futures=True)
     
-    def save_to_csv(self, articles: List[Dict[str, str]], filename: str = "output/all_vc_theses.csv"):
-        """Save articles to CSV file"""
-        if not articles:
+    def save_to_csv(self, articles: Iterable[Dict[str, str]], filename: str = "output/all_vc_theses.csv") -> int:
+        """Save articles to CSV file row by row, returning how many were written"""
+        articles = iter(articles)
+        first = next(articles, None)
+        if first is None:
             logger.warning("No articles to save")
-            return
+            return 0
         
         # Ensure output directory exists
-        import os
         os.makedirs(os.path.dirname(filename), exist_ok=True)
         
+        count = 0
         with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
             fieldnames = ['vc_name', 'title', 'url', 'content', 'date']
             writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
             
             writer.writeheader()
-            for article in articles:
+            for article in chain((first,), articles):
                 writer.writerow(article)
+                count += 1
+                # Rows may trickle in over a long crawl; keep the file current
+                if count % CSV_FLUSH_EVERY == 0:
+                    csvfile.flush()
         
-        logger.info(f"Saved {len(articles)} articles to {filename}")
+        logger.info(f"Saved {count} articles to {filename}")
+        return count
 
 class EnhancedMultiVCScraper(MultiVCScraper):
-    def __init__(self, notion_token: str = None, database_id: str = None):
-        super().__init__()
+    def __init__(self, notion_token: str = None, database_id: str = None, parse_workers: int = None,
+                 http_cache_file: str = None):
+        super().__init__(parse_workers=parse_workers, http_cache_file=http_cache_file)
         self.notion_db = NotionVCDatabase(notion_token, database_id) if notion_token else None
         
-    def _generate_content_hash(self, article: Dict) -> str:
-        """Generate hash for article content"""
-        content = f"{article.get('title', '')}{article.get('content', '')}{article.get('url', '')}"
-        return hashlib.md5(content.encode()).hexdigest()
-        
     def process_and_store_articles(self, articles: List[Dict]) -> Dict:
         """Process articles and store new ones in Notion"""
         stats = {"new": 0, "existing": 0, "errors": 0}
@@ -297,24 +649,35 @@ class EnhancedMultiVCScraper(MultiVCScraper):
             logger.warning("Notion database not configured, skipping storage")
             return stats
         
-        for article in articles:
-            try:
-                content_hash = self._generate_content_hash(article)
-                
-                if not self.notion_db.check_article_exists(content_hash):
-                    # New article - store in Notion
-                    page_id = self.notion_db.create_article_page(article)
-                    logger.info(f"Stored new article: {article.get('title', 'Untitled')[:50]}...")
-                    stats["new"] += 1
-                else:
-                    logger.info(f"Article already exists: {article.get('title', 'Untitled')[:50]}...")
-                    stats["existing"] += 1
-                    
-            except Exception as e:
-                logger.error(f"Error processing article {article.get('title', 'Untitled')}: {e}")
-                stats["errors"] += 1
+        for outcome in self.store_articles(articles):
+            stats[outcome] += 1
                 
         return stats
+    
+    def store_articles(self, articles: List[Dict]) -> List[str]:
+        """Store articles in Notion, returning each one's outcome ("new", "existing" or "errors")"""
+        # Start each run from a fresh snapshot of what is already stored
+        self.notion_db.refresh_existing_articles()
+        
+        # Page creations are independent; NotionVCDatabase rate-limits the shared client
+        with ThreadPoolExecutor(max_workers=NOTION_WORKERS) as executor:
+            return list(executor.map(self._store_article, articles))
+    
+    def _store_article(self, article: Dict) -> str:
+        """Store a single article in Notion and return the stats key it counts towards"""
+        try:
+            if not self.notion_db.article_exists(article):
+                # New article - store in Notion
+                self.notion_db.create_article_page(article)
+                logger.info(f"Stored new article: {article.get('title', 'Untitled')[:50]}...")
+                return "new"
+            
+            logger.info(f"Article already exists: {article.get('title', 'Untitled')[:50]}...")
+            return "existing"
+                
+        except Exception as e:
+            logger.error(f"Error processing article {article.get('title', 'Untitled')}: {e}")
+            return "errors"
         
     def sync_with_notion(self) -> Dict:
         """Main method to scrape and sync with Notion"""
@@ -339,19 +702,19 @@ class EnhancedMultiVCScraper(MultiVCScraper):
 
 def main():
     """Main function to run the scraper"""
-    scraper = MultiVCScraper()
+    # Parse article pages on every core while worker threads keep fetching
+    scraper = MultiVCScraper(parse_workers=os.cpu_count())
     
     # You can specify which VCs to scrape, or leave None to scrape all
     # vc_list = ["accel", "sequoia", "a16z"]  # Specific VCs
     vc_list = None  # All VCs
     
-    # Scrape articles
-    articles = scraper.scrape_all_vcs(vc_list=vc_list, max_articles_per_vc=30)
-    
-    # Save to CSV
-    scraper.save_to_csv(articles)
+    # Scrape articles, writing each VC's results to CSV as soon as they arrive
+    articles = scraper.iter_all_vcs(vc_list=vc_list, max_articles_per_vc=30)
+    count = scraper.save_to_csv(articles)
+    scraper.close()
     
-    print(f"Scraping completed! Total articles: {len(articles)}")
+    print(f"Scraping completed! Total articles: {count}")
 
 if __name__ == "__main__":
     main()
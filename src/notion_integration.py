@@ -1,62 +1,109 @@
 # New file: src/notion_integration.py
 import requests
-from notion_client import Client
-import hashlib
+from notion_client import APIErrorCode, APIResponseError, Client
+import xxhash
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set
 import re
 import logging
+import threading
+import time
+from .utils import RateLimiter
 
 logger = logging.getLogger(__name__)
 
+# Notion allows ~3 requests/second per integration
+NOTION_REQUEST_INTERVAL = 0.34
+# Maximum number of child blocks per pages.create / blocks.children.append call
+NOTION_MAX_BLOCKS_PER_REQUEST = 100
+# Times a call is retried after Notion answers rate_limited
+NOTION_MAX_RETRIES = 3
+
+# Keywords that tag an article with an investment theme; built once, not per article
+THEME_KEYWORDS = {
+    'AI/ML': ['artificial intelligence', 'machine learning', 'AI', 'ML', 'deep learning', 'neural network'],
+    'Fintech': ['fintech', 'financial', 'payments', 'banking', 'lending', 'insurance'],
+    'Healthcare': ['healthcare', 'health', 'medical', 'biotech', 'pharma', 'telemedicine'],
+    'SaaS': ['saas', 'software as a service', 'cloud', 'enterprise software'],
+    'E-commerce': ['ecommerce', 'e-commerce', 'retail', 'marketplace', 'shopping'],
+    'EdTech': ['edtech', 'education', 'learning', 'online courses', 'training'],
+    'Gaming': ['gaming', 'games', 'esports', 'mobile games'],
+    'Mobility': ['mobility', 'transportation', 'logistics', 'delivery', 'ride-sharing'],
+    'Crypto/Web3': ['crypto', 'blockchain', 'web3', 'defi', 'nft'],
+    'Developer Tools': ['developer tools', 'devtools', 'API', 'infrastructure', 'platform']
+}
+# Lower-cased once so each article is only compared against ready-made keywords
+_THEME_KEYWORDS_LOWER = {
+    theme: tuple(keyword.lower() for keyword in keywords) for theme, keywords in THEME_KEYWORDS.items()
+}
+
+# Common patterns for company names in investment announcements
+_COMPANY_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE) for pattern in (
+        r'investment in ([A-Z][a-zA-Z\s]+)',
+        r'backing ([A-Z][a-zA-Z\s]+)',
+        r'funding ([A-Z][a-zA-Z\s]+)',
+        r'"([A-Z][a-zA-Z\s]+)"',
+        r'partnering with ([A-Z][a-zA-Z\s]+)',
+    )
+]
+
+def _paragraph_block(text: str, bold: bool = False) -> Dict:
+    """Build a Notion paragraph block holding a single run of text"""
+    rich_text = {"type": "text", "text": {"content": text}}
+    if bold:
+        rich_text["annotations"] = {"bold": True}
+    return {
+        "object": "block",
+        "type": "paragraph",
+        "paragraph": {"rich_text": [rich_text]}
+    }
+
 class NotionVCDatabase:
     def __init__(self, notion_token: str, database_id: str):
         self.notion = Client(auth=notion_token)
         self.database_id = database_id
+        # Shared by every thread calling the API through this instance
+        self.rate_limiter = RateLimiter(NOTION_REQUEST_INTERVAL)
+        # URLs and content hashes already stored in the database, loaded once per run
+        self._existing_urls: Optional[Set[str]] = None
+        self._existing_hashes: Optional[Set[str]] = None
+        self._existing_lock = threading.Lock()
         
-    def _generate_hash(self, content: str) -> str:
+    def _call(self, endpoint, **kwargs):
+        """Call a Notion endpoint within the rate limit, waiting out rate_limited responses"""
+        for attempt in range(NOTION_MAX_RETRIES + 1):
+            self.rate_limiter.wait()
+            try:
+                return endpoint(**kwargs)
+            except APIResponseError as e:
+                if e.code != APIErrorCode.RateLimited or attempt == NOTION_MAX_RETRIES:
+                    raise
+                retry_after = float(e.headers.get('Retry-After', 1))
+                logger.warning(f"Notion rate limit hit, retrying in {retry_after}s")
+                time.sleep(retry_after)
+        
+    def content_hash(self, content: str) -> str:
         """Generate a hash for content deduplication"""
-        return hashlib.md5(content.encode()).hexdigest()
+        return xxhash.xxh3_64(content.encode()).hexdigest()
         
     def _extract_themes(self, content: str) -> List[Dict]:
         """Extract investment themes from content"""
-        theme_keywords = {
-            'AI/ML': ['artificial intelligence', 'machine learning', 'AI', 'ML', 'deep learning', 'neural network'],
-            'Fintech': ['fintech', 'financial', 'payments', 'banking', 'lending', 'insurance'],
-            'Healthcare': ['healthcare', 'health', 'medical', 'biotech', 'pharma', 'telemedicine'],
-            'SaaS': ['saas', 'software as a service', 'cloud', 'enterprise software'],
-            'E-commerce': ['ecommerce', 'e-commerce', 'retail', 'marketplace', 'shopping'],
-            'EdTech': ['edtech', 'education', 'learning', 'online courses', 'training'],
-            'Gaming': ['gaming', 'games', 'esports', 'mobile games'],
-            'Mobility': ['mobility', 'transportation', 'logistics', 'delivery', 'ride-sharing'],
-            'Crypto/Web3': ['crypto', 'blockchain', 'web3', 'defi', 'nft'],
-            'Developer Tools': ['developer tools', 'devtools', 'API', 'infrastructure', 'platform']
-        }
-        
         content_lower = content.lower()
         detected_themes = []
         
-        for theme, keywords in theme_keywords.items():
-            if any(keyword.lower() in content_lower for keyword in keywords):
+        for theme, keywords in _THEME_KEYWORDS_LOWER.items():
+            if any(keyword in content_lower for keyword in keywords):
                 detected_themes.append({"name": theme})
                 
         return detected_themes if detected_themes else [{"name": "General"}]
         
     def _extract_company_name(self, title: str, content: str) -> str:
         """Extract company name from title or content"""
-        # Common patterns for company names in investment announcements
-        patterns = [
-            r'investment in ([A-Z][a-zA-Z\s]+)',
-            r'backing ([A-Z][a-zA-Z\s]+)',
-            r'funding ([A-Z][a-zA-Z\s]+)',
-            r'"([A-Z][a-zA-Z\s]+)"',
-            r'partnering with ([A-Z][a-zA-Z\s]+)',
-        ]
-        
         text = f"{title} {content[:500]}"
         
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _COMPANY_PATTERNS:
+            match = pattern.search(text)
             if match:
                 company = match.group(1).strip()
                 # Filter out common false positives
@@ -69,13 +116,14 @@ class NotionVCDatabase:
         """Create a new page in Notion database for an article"""
         try:
             company_name = self._extract_company_name(article.get('title', ''), article.get('content', ''))
+            content_hash = self.content_hash(article.get('content', ''))
             
             properties = {
                 "Title": {"title": [{"text": {"content": article.get('title', 'Untitled')[:100]}}]},
                 "VC Firm": {"select": {"name": article.get('vc_name', 'Unknown')}},
                 "URL": {"url": article.get('url', '')},
                 "Date": {"date": {"start": article.get('date', datetime.now().isoformat().split('T')[0])}},
-                "Content Hash": {"rich_text": [{"text": {"content": self._generate_hash(article.get('content', ''))}}]},
+                "Content Hash": {"rich_text": [{"text": {"content": content_hash}}]},
                 "Status": {"select": {"name": "New"}},
                 "Investment Theme": {"multi_select": self._extract_themes(article.get('content', ''))},
                 "Company": {"rich_text": [{"text": {"content": company_name}}]},
@@ -83,42 +131,38 @@ class NotionVCDatabase:
             }
             
             # Create the page with content blocks
-            content_blocks = []
             content = article.get('content', '')
             
             # Split content into chunks for Notion blocks (max 2000 chars per block)
             chunk_size = 1900
-            for i in range(0, len(content), chunk_size):
-                chunk = content[i:i + chunk_size]
-                if chunk.strip():
-                    content_blocks.append({
-                        "object": "block",
-                        "type": "paragraph",
-                        "paragraph": {
-                            "rich_text": [{"type": "text", "text": {"content": chunk}}]
-                        }
-                    })
+            chunks = (content[i:i + chunk_size] for i in range(0, len(content), chunk_size))
+            content_blocks = [_paragraph_block(chunk) for chunk in chunks if chunk.strip()]
             
             # Add URL as a link block
             if article.get('url'):
-                content_blocks.insert(0, {
-                    "object": "block",
-                    "type": "paragraph",
-                    "paragraph": {
-                        "rich_text": [{
-                            "type": "text",
-                            "text": {"content": f"Source: {article['url']}"},
-                            "annotations": {"bold": True}
-                        }]
-                    }
-                })
-            
-            page = self.notion.pages.create(
+                source_block = _paragraph_block(f"Source: {article['url']}", bold=True)
+                content_blocks = [source_block, *content_blocks]
+            
+            page = self._call(
+                self.notion.pages.create,
                 parent={"database_id": self.database_id},
                 properties=properties,
-                children=content_blocks[:10]  # Limit to 10 blocks to avoid API limits
+                children=content_blocks[:NOTION_MAX_BLOCKS_PER_REQUEST]
             )
             
+            # Append any remaining content in batches of the per-request block limit
+            for i in range(NOTION_MAX_BLOCKS_PER_REQUEST, len(content_blocks), NOTION_MAX_BLOCKS_PER_REQUEST):
+                self._call(
+                    self.notion.blocks.children.append,
+                    block_id=page['id'],
+                    children=content_blocks[i:i + NOTION_MAX_BLOCKS_PER_REQUEST]
+                )
+            
+            if self._existing_urls is not None and article.get('url'):
+                self._existing_urls.add(article['url'])
+            if self._existing_hashes is not None:
+                self._existing_hashes.add(content_hash)
+            
             logger.info(f"Created Notion page for: {article.get('title', 'Untitled')[:50]}")
             return page['id']
             
@@ -129,14 +173,63 @@ class NotionVCDatabase:
     def check_article_exists(self, content_hash: str) -> bool:
         """Check if article already exists in database"""
         try:
-            response = self.notion.databases.query(
-                database_id=self.database_id,
-                filter={
-                    "property": "Content Hash",
-                    "rich_text": {"equals": content_hash}
-                }
-            )
-            return len(response['results']) > 0
+            self._ensure_existing_loaded()
+            return content_hash in self._existing_hashes
+        except Exception as e:
+            logger.error(f"Error checking article existence: {e}")
+            return False
+            
+    def load_existing_articles(self):
+        """Fetch the URL and content hash of every page in the database with a paginated query"""
+        urls = set()
+        hashes = set()
+        cursor = None
+        while True:
+            query = {"database_id": self.database_id, "page_size": 100}
+            if cursor:
+                query["start_cursor"] = cursor
+            response = self._call(self.notion.databases.query, **query)
+            
+            for page in response['results']:
+                props = page['properties']
+                url = props.get('URL', {}).get('url')
+                if url:
+                    urls.add(url)
+                hash_text = props.get('Content Hash', {}).get('rich_text', [])
+                if hash_text:
+                    hashes.add(hash_text[0]['plain_text'])
+            
+            if not response.get('has_more'):
+                break
+            cursor = response['next_cursor']
+        
+        self._existing_hashes = hashes
+        self._existing_urls = urls
+        logger.info(f"Loaded {len(urls)} existing article URLs and {len(hashes)} content hashes from Notion")
+    
+    def refresh_existing_articles(self):
+        """Drop the cached URL and hash sets so the next lookup reloads them"""
+        with self._existing_lock:
+            self._existing_urls = None
+            self._existing_hashes = None
+    
+    def _ensure_existing_loaded(self):
+        """Load the existing URL and hash sets on first use"""
+        if self._existing_urls is None:
+            with self._existing_lock:
+                if self._existing_urls is None:
+                    self.load_existing_articles()
+    
+    def article_exists(self, article: Dict) -> bool:
+        """Check if an article is stored under its URL, or its text under another one"""
+        return (self.url_exists(article.get('url', ''))
+                or self.check_article_exists(self.content_hash(article.get('content', ''))))
+    
+    def url_exists(self, url: str) -> bool:
+        """Check if an article URL is already stored, loading the URL set on first use"""
+        try:
+            self._ensure_existing_loaded()
+            return url in self._existing_urls
         except Exception as e:
             logger.error(f"Error checking article existence: {e}")
             return False
@@ -148,7 +241,8 @@ class NotionVCDatabase:
         cutoff_date = (datetime.now() - timedelta(days=days)).isoformat().split('T')[0]
         
         try:
-            response = self.notion.databases.query(
+            response = self._call(
+                self.notion.databases.query,
                 database_id=self.database_id,
                 filter={
                     "property": "Date",
@@ -180,7 +274,8 @@ class NotionVCDatabase:
     def update_article_status(self, page_id: str, status: str):
         """Update the status of an article"""
         try:
-            self.notion.pages.update(
+            self._call(
+                self.notion.pages.update,
                 page_id=page_id,
                 properties={
                     "Status": {"select": {"name": status}}
@@ -1,27 +1,65 @@
 import requests
-from bs4 import BeautifulSoup
-import pandas as pd
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from lxml.cssselect import CSSSelector
+import csv
+import os
 import yaml
 import time
 import logging
+import functools
+import re
 from urllib.parse import urljoin, urlparse
 from urllib.robotparser import RobotFileParser
-import hashlib
-from utils import clean_article_text
+import xxhash
+from utils import clean_article_text, declared_charset, parse_html
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+DEFAULT_ARTICLE_SELECTORS = (
+    'article a', '.post a', '.blog-post a',
+    '.content a', '.insights a', '.news-item a'
+)
+
+@functools.lru_cache(maxsize=None)
+def _compile_article_selectors(selectors):
+    """Compile CSS selectors to XPath once per selector list instead of on every page"""
+    return tuple(CSSSelector(selector, translator='html') for selector in selectors)
+
+DEFAULT_KEYWORDS = ('blog', 'thesis', 'memo', 'insight', 'portfolio', 'investment')
+DEFAULT_EXCLUDE_KEYWORDS = ('contact', 'team', 'about', 'careers', 'privacy')
+
+@functools.lru_cache(maxsize=None)
+def _compile_keywords(keywords):
+    """Combine a keyword list into one regex so each link is scanned once"""
+    # An empty list must match nothing, like any() over no keywords
+    return re.compile('|'.join(re.escape(keyword) for keyword in keywords) or r'(?!)')
+
 class VCBlogScraper:
     def __init__(self, config_file='vc_sources.yaml', delay=2):
         self.delay = delay
         self.session = requests.Session()
         self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (compatible; VC-Thesis-Bot/1.0)'
+            'User-Agent': 'Mozilla/5.0 (compatible; VC-Thesis-Bot/1.0)',
+            'Connection': 'keep-alive'
         })
+        # Reuse warm connections per host and retry transient failures
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=16,
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         self.results = []
         self.seen_urls = set()
+        # 64-bit content digests of saved articles; duplicates are dropped as they are scraped
+        self.seen_hashes = set()
+        self.duplicate_count = 0
+        # Parsed robots.txt per scheme://netloc, fetched once per host
+        self._robots = {}
         
         # Load VC sources
         with open(config_file, 'r') as f:
@@ -31,14 +69,28 @@ class VCBlogScraper:
         """Check if we can fetch the URL according to robots.txt"""
         try:
             parsed_url = urlparse(url)
-            robots_url = f"{parsed_url.scheme}://{parsed_url.netloc}/robots.txt"
-            rp = RobotFileParser()
-            rp.set_url(robots_url)
-            rp.read()
-            return rp.can_fetch('*', url)
+            rp = self._robots_for(f"{parsed_url.scheme}://{parsed_url.netloc}")
+            return rp is None or rp.can_fetch('*', url)
         except:
             return True  # If we can't check robots.txt, assume it's OK
     
+    def _robots_for(self, origin):
+        """Fetch and parse a host's robots.txt once over the pooled session (None if unavailable)"""
+        if origin not in self._robots:
+            rp = None
+            try:
+                resp = self.session.get(f"{origin}/robots.txt", timeout=15)
+                if resp.status_code in (401, 403):
+                    rp = RobotFileParser()
+                    rp.disallow_all = True
+                elif resp.ok:
+                    rp = RobotFileParser()
+                    rp.parse(resp.text.splitlines())
+            except requests.RequestException as e:
+                logger.debug(f"Could not read robots.txt for {origin}: {e}")
+            self._robots[origin] = rp
+        return self._robots[origin]
+    
     def is_relevant_link(self, href, vc_config):
         """Check if a link is relevant based on keywords and patterns"""
         if not href:
@@ -47,42 +99,35 @@ class VCBlogScraper:
         href_lower = href.lower()
         
         # Get keywords from config or use defaults
-        keywords = vc_config.get('keywords', ['blog', 'thesis', 'memo', 'insight', 'portfolio', 'investment'])
-        exclude_keywords = vc_config.get('exclude_keywords', ['contact', 'team', 'about', 'careers', 'privacy'])
+        keywords = _compile_keywords(tuple(vc_config.get('keywords', DEFAULT_KEYWORDS)))
+        exclude_keywords = _compile_keywords(tuple(vc_config.get('exclude_keywords', DEFAULT_EXCLUDE_KEYWORDS)))
         
-        # Check if any keyword is in the URL
-        has_keyword = any(keyword in href_lower for keyword in keywords)
-        
-        # Check if any exclude keyword is in the URL
-        has_exclude = any(exclude in href_lower for exclude in exclude_keywords)
-        
-        return has_keyword and not has_exclude
+        # Check if any keyword is in the URL, and only then for an exclude keyword
+        return keywords.search(href_lower) is not None and exclude_keywords.search(href_lower) is None
     
-    def extract_article_links(self, soup, base_url, vc_config):
+    def extract_article_links(self, tree, base_url, vc_config):
         """Extract relevant article links from the page"""
         links = []
         
         # Try different selectors based on VC configuration
-        selectors = vc_config.get('article_selectors', [
-            'article a', '.post a', '.blog-post a', 
-            '.content a', '.insights a', '.news-item a'
-        ])
+        selectors = _compile_article_selectors(tuple(vc_config.get('article_selectors', DEFAULT_ARTICLE_SELECTORS)))
         
         for selector in selectors:
-            found_links = soup.select(selector)
+            found_links = selector(tree)
             if found_links:
                 links.extend(found_links)
         
         # Fallback to all links if no specific selectors work
         if not links:
-            links = soup.find_all('a', href=True)
+            links = tree.xpath('//a[@href]')
         
         relevant_links = []
         for link in links:
             href = link.get('href', '')
             if self.is_relevant_link(href, vc_config):
                 full_url = urljoin(base_url, href)
-                title = link.get_text(strip=True) or link.get('title', '')
+                # Collapse the newlines and indentation of nested markup into single spaces
+                title = ' '.join(link.text_content().split()) or link.get('title', '')
                 
                 if full_url not in self.seen_urls and title:
                     relevant_links.append((full_url, title))
@@ -104,10 +149,11 @@ class VCBlogScraper:
             
             resp = self.session.get(base_url, timeout=15)
             resp.raise_for_status()
-            soup = BeautifulSoup(resp.text, 'html.parser')
+            # Decode with the HTTP charset, like resp.text would
+            tree = parse_html(resp.content, declared_charset(resp))
             
             # Extract article links
-            article_links = self.extract_article_links(soup, base_url, vc_config)
+            article_links = self.extract_article_links(tree, base_url, vc_config)
             logger.info(f"Found {len(article_links)} relevant links for {vc_name}")
             
             # Scrape each article
@@ -121,15 +167,18 @@ class VCBlogScraper:
                     
                     if len(content.strip()) > 100:  # Only save if content is substantial
                         # Create a hash to avoid duplicates
-                        content_hash = hashlib.md5(content.encode()).hexdigest()
+                        content_hash = xxhash.xxh3_64_intdigest(content.encode())
                         
-                        self.results.append({
-                            "VC Name": vc_name,
-                            "Title": title,
-                            "URL": url,
-                            "Content": content,
-                            "Content Hash": content_hash
-                        })
+                        if content_hash in self.seen_hashes:
+                            self.duplicate_count += 1
+                        else:
+                            self.seen_hashes.add(content_hash)
+                            self.results.append({
+                                "VC Name": vc_name,
+                                "Title": title,
+                                "URL": url,
+                                "Content": content
+                            })
                     
                     time.sleep(self.delay)
                     
@@ -154,21 +203,17 @@ class VCBlogScraper:
             logger.warning("No results to save")
             return
         
-        df = pd.DataFrame(self.results)
-        
-        # Remove duplicates based on content hash
-        original_count = len(df)
-        df = df.drop_duplicates(subset=['Content Hash'])
-        df = df.drop(columns=['Content Hash'])  # Remove hash column from final output
-        
-        logger.info(f"Removed {original_count - len(df)} duplicate articles")
+        # Duplicates were already skipped by content hash while scraping
+        logger.info(f"Removed {self.duplicate_count} duplicate articles")
         
         # Create output directory if it doesn't exist
-        import os
         os.makedirs(os.path.dirname(output_file), exist_ok=True)
         
-        df.to_csv(output_file, index=False)
-        logger.info(f"✅ Scraped and saved {len(df)} unique articles to {output_file}")
+        with open(output_file, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=['VC Name', 'Title', 'URL', 'Content'])
+            writer.writeheader()
+            writer.writerows(self.results)
+        logger.info(f"✅ Scraped and saved {len(self.results)} unique articles to {output_file}")
 
 if __name__ == "__main__":
     scraper = VCBlogScraper()
@@ -1,29 +1,42 @@
 import os
-import json
+import orjson
 import logging
-import hashlib
-import pandas as pd
+import xxhash
+import csv
+from array import array
 from datetime import datetime, timedelta
 from typing import Dict, List, Set
-from dotenv import load_dotenv
-import schedule
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import time
 
-from .multi_vc_scraper import EnhancedMultiVCScraper
+from .multi_vc_scraper import EnhancedMultiVCScraper, MAX_CONCURRENT_VCS
 from .notion_integration import NotionVCDatabase
+from .utils import next_run_at
 from config.vc_config import load_vc_configs
+from config.notion_config import get_notion_config
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Journal records kept before the state snapshot is rewritten (at least one per tracked URL)
+JOURNAL_COMPACT_MIN_ENTRIES = 500
+# Columns of the incremental CSV, in the order the scraper produces article fields
+CSV_FIELDS = ('vc_name', 'title', 'url', 'content', 'date', 'scraped_at')
+# Hash function behind the stored content signatures; state written with another one is migrated
+SIGNATURE_ALGO = 'xxh3_64'
+
 class SmartVCMonitor:
-    def __init__(self, state_file="data/scraper_state.json", csv_file="output/vc_articles_incremental.csv"):
-        load_dotenv()
-        
+    def __init__(self, state_file="data/scraper_state.json", csv_file="output/vc_articles_incremental.csv",
+                 notion_hashes_file=None):
         self.state_file = state_file
+        # Kept next to the state by default, so --state-file moves both
+        self.notion_hashes_file = notion_hashes_file or os.path.join(os.path.dirname(state_file), "notion_hashes.bin")
+        self.journal_file = f"{state_file}.jsonl"
         self.csv_file = csv_file
-        self.notion_token = os.getenv('NOTION_TOKEN')
-        self.database_id = os.getenv('NOTION_DATABASE_ID')
+        notion_config = get_notion_config()
+        self.notion_token = notion_config.token
+        self.database_id = notion_config.database_id
         
         # Initialize components
         self.scraper = EnhancedMultiVCScraper(self.notion_token, self.database_id)
@@ -32,56 +45,170 @@ class SmartVCMonitor:
         # Ensure directories exist
         os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
         os.makedirs(os.path.dirname(self.csv_file), exist_ok=True)
+        os.makedirs(os.path.dirname(self.notion_hashes_file) or '.', exist_ok=True)
         
-        # Load existing state
+        # Load existing state once; it stays in memory for the lifetime of the monitor
+        self._state_lock = threading.RLock()
+        self._needs_compaction = False
         self.state = self.load_state()
+        # Every processed URL is appended and flushed here as it is recorded
+        self._journal = open(self.journal_file, 'ab')
+        if self._needs_compaction:
+            self.compact_state()
+        # Content hashes of articles known to be in Notion; lets repeat articles skip the API
+        self.notion_hashes = self.load_notion_hashes()
         
     def load_state(self) -> Dict:
         """Load previous scraping state to track what's already been processed"""
+        state = {
+            'seen_urls': {},  # url -> {'hash': content_hash, 'scraped_at': epoch seconds}
+            'last_run': None,  # epoch seconds
+            'total_articles_scraped': 0,
+            'vc_stats': {},  # vc_name -> {'last_scraped': timestamp, 'total_articles': count}
+            'hash_algo': SIGNATURE_ALGO
+        }
+        
         if os.path.exists(self.state_file):
             try:
-                with open(self.state_file, 'r') as f:
-                    state = json.load(f)
-                logger.info(f"Loaded state with {len(state.get('seen_urls', {}))} tracked URLs")
-                return state
+                with open(self.state_file, 'rb') as f:
+                    state = orjson.loads(f.read())
             except Exception as e:
                 logger.warning(f"Could not load state file: {e}")
         
-        # Default state structure
-        return {
-            'seen_urls': {},  # url -> {'hash': content_hash, 'scraped_at': timestamp}
-            'last_run': None,
-            'total_articles_scraped': 0,
-            'vc_stats': {}  # vc_name -> {'last_scraped': timestamp, 'total_articles': count}
-        }
+        # Decided by the snapshot: the journal only ever extends the snapshot it follows, and
+        # is truncated by the compaction that rewrites the snapshot with the current algorithm
+        legacy_signatures = state.get('hash_algo') != SIGNATURE_ALGO
+        
+        # Replay changes journaled since the last snapshot
+        self._journal_entries = 0
+        if os.path.exists(self.journal_file):
+            try:
+                with open(self.journal_file, 'rb') as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        try:
+                            record = orjson.loads(line)
+                        except orjson.JSONDecodeError:
+                            # A record torn by a crash; skip it and rewrite the snapshot so
+                            # later appends do not land on the same line
+                            logger.warning(f"Skipping damaged record in {self.journal_file}")
+                            self._needs_compaction = True
+                            continue
+                        if 'meta' in record:
+                            state.update(record['meta'])
+                        else:
+                            if legacy_signatures:
+                                record.pop('hash', None)
+                            state['seen_urls'][record.pop('url')] = record
+                        self._journal_entries += 1
+            except Exception as e:
+                logger.warning(f"Could not replay state journal: {e}")
+        
+        if legacy_signatures:
+            # Older signatures (MD5, SimHash) can never match the current ones; drop them rather than
+            # reporting every tracked article as changed
+            for entry in state['seen_urls'].values():
+                entry.pop('hash', None)
+            state['hash_algo'] = SIGNATURE_ALGO
+            # Always rewrite the snapshot, so signatures journaled from now on are not dropped again
+            self._needs_compaction = True
+            if state['seen_urls']:
+                logger.info(f"Dropped legacy content signatures for {len(state['seen_urls'])} tracked URLs")
+        
+        # Timestamps used to be ISO strings; convert them once to epoch seconds
+        if isinstance(state.get('last_run'), str):
+            state['last_run'] = datetime.fromisoformat(state['last_run']).timestamp()
+        for entry in state['seen_urls'].values():
+            if isinstance(entry.get('scraped_at'), str):
+                entry['scraped_at'] = datetime.fromisoformat(entry['scraped_at']).timestamp()
+                self._needs_compaction = True
+        
+        if state['seen_urls']:
+            logger.info(f"Loaded state with {len(state['seen_urls'])} tracked URLs")
+        return state
     
-    def save_state(self):
-        """Save current state to file"""
+    def _append_journal(self, record: Dict):
+        """Write one record to the journal; callers hold the state lock"""
+        self._journal.write(orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE))
+        self._journal_entries += 1
+    
+    def record_seen_url(self, url: str, entry: Dict):
+        """Track a processed URL and append it to the state journal"""
+        with self._state_lock:
+            self.state['seen_urls'][url] = entry
+            self._append_journal({'url': url, **entry})
+            # Hand the record to the OS right away so a crash mid-run cannot lose it
+            self._journal.flush()
+    
+    def save_state(self, compact: bool = False):
+        """Journal the run metadata and flush, compacting the journal when it grows large"""
         try:
-            self.state['last_run'] = datetime.now().isoformat()
-            with open(self.state_file, 'w') as f:
-                json.dump(self.state, f, indent=2)
+            with self._state_lock:
+                self.state['last_run'] = time.time()
+                meta = {key: self.state[key] for key in ('last_run', 'total_articles_scraped', 'vc_stats')}
+                self._append_journal({'meta': meta})
+                self._journal.flush()
+                
+                # Rewrite the snapshot only once the journal outgrows it
+                if compact or self._journal_entries > max(JOURNAL_COMPACT_MIN_ENTRIES, len(self.state['seen_urls'])):
+                    self.compact_state()
             logger.info("State saved successfully")
         except Exception as e:
             logger.error(f"Failed to save state: {e}")
     
-    def generate_content_signature(self, article: Dict) -> str:
-        """Generate a unique signature for article content"""
-        content = f"{article.get('title', '')}{article.get('url', '')}{article.get('content', '')[:500]}"
-        return hashlib.md5(content.encode()).hexdigest()
+    def save_state_in_background(self) -> threading.Thread:
+        """Persist state on a separate thread; the in-memory state stays authoritative"""
+        # Not a daemon thread, so the interpreter waits for the write before exiting
+        thread = threading.Thread(target=self.save_state, name="state-flush")
+        thread.start()
+        return thread
     
-    def is_new_article(self, article: Dict) -> bool:
-        """Check if this article is new or has been updated"""
-        url = article.get('url', '')
-        current_signature = self.generate_content_signature(article)
-        
-        if url not in self.state['seen_urls']:
+    def compact_state(self):
+        """Write a full state snapshot atomically and truncate the journal"""
+        # Held throughout so no record lands in the journal between snapshot and truncation
+        with self._state_lock:
+            snapshot = orjson.dumps(self.state, option=orjson.OPT_APPEND_NEWLINE)
+            tracked = len(self.state['seen_urls'])
+            
+            tmp_file = f"{self.state_file}.tmp"
+            with open(tmp_file, 'wb') as f:
+                f.write(snapshot)
+            os.replace(tmp_file, self.state_file)
+            
+            self._journal.truncate(0)
+            self._journal_entries = 0
+        logger.info(f"Compacted state snapshot with {tracked} tracked URLs")
+    
+    def generate_content_signature(self, article: Dict) -> int:
+        """Generate a 64-bit signature of the article's title, URL and full content"""
+        # Fields are fed to the hash one by one; no combined string is ever built
+        h = xxhash.xxh3_64()
+        h.update(article.get('title', '').encode())
+        h.update(article.get('url', '').encode())
+        h.update(article.get('content', '').encode())
+        return h.intdigest()
+    
+    def is_new_article(self, url: str, current_signature: int) -> bool:
+        """Check if the article at url is new or has been updated"""
+        # Unseen URLs are new without looking at the signature
+        entry = self.state['seen_urls'].get(url)
+        if entry is None:
             return True
         
-        # Check if content has changed
-        previous_signature = self.state['seen_urls'][url].get('hash', '')
+        # Check if content has changed; entries migrated without a signature count as unchanged
+        previous_signature = entry.get('hash')
+        if previous_signature is None:
+            return False
         return current_signature != previous_signature
     
+    def _extract_with_signature(self, url: str, vc_config: Dict):
+        """Fetch an article and sign it on the worker thread, returning (article, signature)"""
+        article = self.scraper.extract_content(url, vc_config)
+        if not article:
+            return None, None
+        return article, self.generate_content_signature(article)
+    
     def discover_new_links_for_vc(self, vc_config: Dict) -> Set[str]:
         """Discover only new links for a specific VC since last run"""
         vc_key = vc_config['key']
@@ -90,13 +217,11 @@ class SmartVCMonitor:
         logger.info(f"🔍 Checking for new links from {vc_name}")
         
         # Use the existing discovery method but limit scope
-        links = self.scraper.discover_links(vc_key, vc_config)
+        links = set(self.scraper.discover_links(vc_key, vc_config))
         
-        # Filter to only new/unseen URLs
-        new_links = set()
-        for link in links:
-            if link not in self.state['seen_urls']:
-                new_links.add(link)
+        # Filter to only new/unseen URLs; difference() probes the dict directly
+        with self._state_lock:
+            new_links = links.difference(self.state['seen_urls'])
         
         logger.info(f"📊 {vc_name}: {len(links)} total links, {len(new_links)} new links")
         return new_links
@@ -116,35 +241,41 @@ class SmartVCMonitor:
         new_articles = []
         processed = 0
         
-        for url in list(new_links)[:max_new_articles]:  # Limit processing
-            try:
-                article = self.scraper.extract_content(url, vc_config)
-                if article and self.is_new_article(article):
-                    new_articles.append(article)
+        # Article pages of one VC share a host; fetch a few at a time over the pooled session
+        urls = list(new_links)[:max_new_articles]  # Limit processing
+        with ThreadPoolExecutor(max_workers=self.scraper.max_workers_per_vc) as executor:
+            futures = {executor.submit(self._extract_with_signature, url, vc_config): url for url in urls}
+            for future in as_completed(futures):
+                url = futures[future]
+                try:
+                    article, signature = future.result()
+                    if article and self.is_new_article(url, signature):
+                        new_articles.append(article)
+                        
+                        # Update state
+                        self.record_seen_url(url, {
+                            'hash': signature,
+                            'scraped_at': time.time(),
+                            'vc_name': vc_name
+                        })
+                        
+                        logger.info(f"📰 NEW: {article['title'][:60]}...")
                     
-                    # Update state
-                    self.state['seen_urls'][url] = {
-                        'hash': self.generate_content_signature(article),
-                        'scraped_at': datetime.now().isoformat(),
-                        'vc_name': vc_name
-                    }
-                    
-                    logger.info(f"📰 NEW: {article['title'][:60]}...")
-                
-                processed += 1
-                if processed % 5 == 0:
-                    logger.info(f"Processed {processed}/{len(new_links)} new URLs for {vc_name}")
-                    
-            except Exception as e:
-                logger.error(f"Error processing {url}: {e}")
-                continue
+                    processed += 1
+                    if processed % 5 == 0:
+                        logger.info(f"Processed {processed}/{len(new_links)} new URLs for {vc_name}")
+                        
+                except Exception as e:
+                    logger.error(f"Error processing {url}: {e}")
+                    continue
         
         # Update VC stats
-        if vc_name not in self.state['vc_stats']:
-            self.state['vc_stats'][vc_name] = {'total_articles': 0}
-        
-        self.state['vc_stats'][vc_name]['last_scraped'] = datetime.now().isoformat()
-        self.state['vc_stats'][vc_name]['total_articles'] += len(new_articles)
+        with self._state_lock:
+            if vc_name not in self.state['vc_stats']:
+                self.state['vc_stats'][vc_name] = {'total_articles': 0}
+            
+            self.state['vc_stats'][vc_name]['last_scraped'] = datetime.now().isoformat()
+            self.state['vc_stats'][vc_name]['total_articles'] += len(new_articles)
         
         logger.info(f"✅ {vc_name}: Found {len(new_articles)} new articles")
         return new_articles
@@ -162,28 +293,29 @@ class SmartVCMonitor:
             'runtime_minutes': 0
         }
         
-        # Check each VC for new articles
-        for i, vc_config in enumerate(self.vc_configs, 1):
-            vc_name = vc_config['name']
-            logger.info(f"[{i}/{len(self.vc_configs)}] Checking {vc_name}...")
+        # Check VCs concurrently; each is its own host and the scraper rate-limits per host
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_VCS) as executor:
+            futures = {}
+            for i, vc_config in enumerate(self.vc_configs, 1):
+                logger.info(f"[{i}/{len(self.vc_configs)}] Checking {vc_config['name']}...")
+                futures[executor.submit(self.scrape_new_articles_for_vc, vc_config, 15)] = vc_config['name']
             
-            try:
-                new_articles = self.scrape_new_articles_for_vc(vc_config, max_new_articles=15)
-                
-                if new_articles:
-                    all_new_articles.extend(new_articles)
-                    stats['by_vc'][vc_name] = len(new_articles)
-                    stats['total_new'] += len(new_articles)
-                else:
+            for future in as_completed(futures):
+                vc_name = futures[future]
+                try:
+                    new_articles = future.result()
+                    
+                    if new_articles:
+                        all_new_articles.extend(new_articles)
+                        stats['by_vc'][vc_name] = len(new_articles)
+                        stats['total_new'] += len(new_articles)
+                    else:
+                        stats['by_vc'][vc_name] = 0
+                    
+                except Exception as e:
+                    logger.error(f"❌ Error checking {vc_name}: {e}")
+                    stats['errors'] += 1
                     stats['by_vc'][vc_name] = 0
-                
-                # Small delay between VCs
-                time.sleep(2)
-                
-            except Exception as e:
-                logger.error(f"❌ Error checking {vc_name}: {e}")
-                stats['errors'] += 1
-                stats['by_vc'][vc_name] = 0
         
         # Save new articles
         if all_new_articles:
@@ -191,36 +323,75 @@ class SmartVCMonitor:
             
             # Store in Notion if available
             if self.scraper.notion_db:
-                notion_stats = self.scraper.process_and_store_articles(all_new_articles)
+                notion_stats = self.store_in_notion(all_new_articles)
                 logger.info(f"💾 Notion: {notion_stats['new']} new, {notion_stats['existing']} existing")
         
         # Update stats and save state
         end_time = datetime.now()
         stats['runtime_minutes'] = round((end_time - start_time).total_seconds() / 60, 2)
         self.state['total_articles_scraped'] += stats['total_new']
-        self.save_state()
+        self.save_state_in_background()
         
         # Log summary
         self.log_daily_summary(stats)
         return stats
     
+    def load_notion_hashes(self) -> Set[int]:
+        """Load the 64-bit content hashes of articles already stored in Notion"""
+        hashes = array('Q')
+        if os.path.exists(self.notion_hashes_file):
+            with open(self.notion_hashes_file, 'rb') as f:
+                data = f.read()
+            # Ignore a partially written trailing record
+            hashes.frombytes(data[:len(data) - len(data) % hashes.itemsize])
+        return set(hashes)
+    
+    def store_in_notion(self, articles: List[Dict]) -> Dict:
+        """Store articles in Notion, skipping locally known ones before any API call"""
+        keys = [xxhash.xxh3_64_intdigest(article.get('content', '').encode()) for article in articles]
+        pending = [(key, article) for key, article in zip(keys, articles) if key not in self.notion_hashes]
+        stats = {"new": 0, "existing": len(articles) - len(pending), "errors": 0}
+        if not pending:
+            return stats
+        
+        outcomes = self.scraper.store_articles([article for _, article in pending])
+        stored = array('Q')
+        for (key, _), outcome in zip(pending, outcomes):
+            stats[outcome] += 1
+            if outcome != "errors":
+                stored.append(key)
+        
+        # Append-only; a run only writes the hashes it learned about
+        self.notion_hashes.update(stored)
+        try:
+            with open(self.notion_hashes_file, 'ab') as f:
+                stored.tofile(f)
+        except OSError as e:
+            # Only a cache: the pages exist, and Notion's own duplicate check still applies
+            logger.warning(f"Could not record Notion hashes in {self.notion_hashes_file}: {e}")
+        return stats
+    
     def save_new_articles(self, new_articles: List[Dict]):
         """Save new articles to CSV (append mode)"""
         if not new_articles:
             return
         
-        df_new = pd.DataFrame(new_articles)
-        
         # Add timestamp
-        df_new['scraped_at'] = datetime.now().isoformat()
+        scraped_at = datetime.now().isoformat()
         
         # Append to existing CSV or create new one
-        if os.path.exists(self.csv_file):
-            df_new.to_csv(self.csv_file, mode='a', header=False, index=False)
-            logger.info(f"📊 Appended {len(new_articles)} new articles to {self.csv_file}")
-        else:
-            df_new.to_csv(self.csv_file, index=False)
+        is_new_file = not os.path.exists(self.csv_file) or os.path.getsize(self.csv_file) == 0
+        with open(self.csv_file, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction='ignore')
+            if is_new_file:
+                writer.writeheader()
+            for article in new_articles:
+                writer.writerow({**article, 'scraped_at': scraped_at})
+        
+        if is_new_file:
             logger.info(f"📊 Created {self.csv_file} with {len(new_articles)} articles")
+        else:
+            logger.info(f"📊 Appended {len(new_articles)} new articles to {self.csv_file}")
     
     def log_daily_summary(self, stats: Dict):
         """Log a comprehensive daily summary"""
@@ -245,7 +416,8 @@ class SmartVCMonitor:
     def get_monitoring_status(self) -> Dict:
         """Get current monitoring status"""
         return {
-            'last_run': self.state.get('last_run'),
+            'last_run': (datetime.fromtimestamp(self.state['last_run']).strftime('%Y-%m-%d %H:%M:%S')
+                         if self.state.get('last_run') else None),
             'total_articles_tracked': len(self.state['seen_urls']),
             'total_scraped': self.state.get('total_articles_scraped', 0),
             'vc_stats': self.state.get('vc_stats', {}),
@@ -256,29 +428,34 @@ class SmartVCMonitor:
         """Get next scheduled run time"""
         # This would depend on your scheduling setup
         if self.state.get('last_run'):
-            last_run = datetime.fromisoformat(self.state['last_run'])
+            last_run = datetime.fromtimestamp(self.state['last_run'])
             next_run = last_run + timedelta(days=1)
             return next_run.strftime('%Y-%m-%d %H:%M:%S')
         return "Not scheduled"
     
     def cleanup_old_entries(self, days_to_keep: int = 90):
         """Clean up old entries from state to prevent it from growing too large"""
-        cutoff_date = datetime.now() - timedelta(days=days_to_keep)
-        cutoff_iso = cutoff_date.isoformat()
-        
-        original_count = len(self.state['seen_urls'])
+        cutoff = time.time() - days_to_keep * 86400
         
-        # Remove old entries
-        self.state['seen_urls'] = {
-            url: data for url, data in self.state['seen_urls'].items()
-            if data.get('scraped_at', '') >= cutoff_iso
-        }
-        
-        cleaned_count = original_count - len(self.state['seen_urls'])
+        with self._state_lock:
+            original_count = len(self.state['seen_urls'])
+            
+            # Remove old entries
+            self.state['seen_urls'] = {
+                url: data for url, data in self.state['seen_urls'].items()
+                if data.get('scraped_at', 0) >= cutoff
+            }
+            
+            cleaned_count = original_count - len(self.state['seen_urls'])
         if cleaned_count > 0:
             logger.info(f"🧹 Cleaned up {cleaned_count} old entries (kept {days_to_keep} days)")
-            self.save_state()
+            # Removals cannot be journaled, so rewrite the snapshot
+            self.save_state(compact=True)
+
 
+# Old entries are pruned once a week, on Sunday (weekday 6) night
+WEEKLY_CLEANUP_WEEKDAY = 6
+WEEKLY_CLEANUP_TIME = "02:00"
 
 class DailyScheduler:
     def __init__(self, monitor: SmartVCMonitor, run_time: str = "09:00"):
@@ -288,20 +465,28 @@ class DailyScheduler:
     def start_daily_monitoring(self):
         """Start the daily monitoring schedule"""
         logger.info(f"🕘 Scheduling daily VC monitoring at {self.run_time}")
+        logger.info(f"🧹 Weekly cleanup runs on Sundays at {WEEKLY_CLEANUP_TIME}")
         
-        # Schedule daily run
-        schedule.every().day.at(self.run_time).do(self.monitor.run_daily_check)
-        
-        # Optional: Add a cleanup job weekly
-        schedule.every().sunday.at("02:00").do(lambda: self.monitor.cleanup_old_entries())
-        
+        next_check = next_run_at(self.run_time)
+        next_cleanup = next_run_at(WEEKLY_CLEANUP_TIME, weekday=WEEKLY_CLEANUP_WEEKDAY)
         logger.info("⏰ Scheduler started. Waiting for scheduled runs...")
-        logger.info(f"💡 Next run: Today at {self.run_time} (if not already passed)")
+        logger.info(f"💡 Next run: {next_check:%Y-%m-%d %H:%M}")
         
-        # Keep the script running
+        # Sleep straight through to the next due job instead of polling every minute; a job
+        # whose time passed while asleep (e.g. suspend) still runs, just late
         while True:
-            schedule.run_pending()
-            time.sleep(60)  # Check every minute
+            due = min(next_check, next_cleanup)
+            delay = (due - datetime.now()).total_seconds()
+            if delay > 0:
+                time.sleep(delay)
+            
+            if next_check <= due:
+                self.monitor.run_daily_check()
+                next_check = next_run_at(self.run_time)
+            
+            if next_cleanup <= due:
+                self.monitor.cleanup_old_entries()
+                next_cleanup = next_run_at(WEEKLY_CLEANUP_TIME, weekday=WEEKLY_CLEANUP_WEEKDAY)
 
 
 def main():
@@ -1,98 +1,293 @@
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from requests.utils import DEFAULT_ACCEPT_ENCODING, get_encoding_from_headers
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer, UnicodeDammit
+import lxml.html
+import soupsieve
+import os
 import re
+import sqlite3
+import time
 import logging
-from typing import Dict
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional
 
 logger = logging.getLogger(__name__)
 
-def clean_article_text(url, max_retries=3):
+class RateLimiter:
+    """Thread-safe limiter that spaces calls at least `interval` seconds apart"""
+    
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.base_interval = interval
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+    
+    def wait(self):
+        """Block until the caller may issue its next call"""
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        
+        if delay > 0:
+            time.sleep(delay)
+    
+    def backoff(self, factor: float = 2.0, max_interval: float = 60.0):
+        """Widen the interval after the remote side signals it is overloaded"""
+        with self._lock:
+            self.interval = min(max_interval, max(self.interval, 1.0) * factor)
+    
+    def recover(self, factor: float = 2.0):
+        """Narrow a widened interval back towards its base after a successful call"""
+        if self.interval <= self.base_interval:
+            return
+        with self._lock:
+            self.interval = max(self.base_interval, self.interval / factor)
+
+def next_run_at(run_time: str, now: Optional[datetime] = None, weekday: Optional[int] = None) -> datetime:
+    """The next HH:MM time after now, on the given weekday (Monday is 0) or any day"""
+    now = now or datetime.now()
+    hour, minute = map(int, run_time.split(':'))
+    next_run = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if weekday is not None:
+        next_run += timedelta(days=(weekday - now.weekday()) % 7)
+    if next_run <= now:
+        next_run += timedelta(days=1 if weekday is None else 7)
+    return next_run
+
+def seconds_until(run_times: Iterable[str], now: Optional[datetime] = None) -> float:
+    """Seconds from now until the next of the given daily HH:MM times"""
+    now = now or datetime.now()
+    return (min(next_run_at(run_time, now) for run_time in run_times) - now).total_seconds()
+
+def declared_charset(response: requests.Response) -> Optional[str]:
+    """The charset named in a response's Content-Type header, or None"""
+    if 'charset' not in response.headers.get('Content-Type', '').lower():
+        return None
+    return get_encoding_from_headers(response.headers)
+
+def html_parser(encoding: Optional[str]) -> Optional[lxml.html.HTMLParser]:
+    """Create an HTML parser for the given encoding, or None if libxml2 does not know it"""
+    try:
+        return lxml.html.HTMLParser(encoding=encoding)
+    except LookupError:
+        return None
+
+def parse_html(body: bytes, encoding: Optional[str] = None):
+    """Parse raw page bytes, detecting the encoding like BeautifulSoup when none is usable"""
+    parser = html_parser(encoding) if encoding else None
+    if parser is None:
+        parser = html_parser(UnicodeDammit(body, is_html=True).original_encoding) or lxml.html.HTMLParser()
+    return lxml.html.fromstring(body, parser=parser)
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_URL_RE = re.compile(r'https?://\S+')
+# Common navigation/footer text; each pattern swallows the rest of the page, so one
+# alternation cuts at the earliest of them exactly like applying them one by one
+_UNWANTED_TEXT_RE = re.compile('|'.join(f'(?:{pattern})' for pattern in (
+    r'Get in Touch.*',
+    r'Dark Mode.*',
+    r'Made with.*',
+    r'Copyright.*',
+    r'All rights reserved.*',
+    r'Follow us.*',
+    r'Subscribe.*',
+    r'Share this.*',
+    r'Contact us.*'
+)), re.IGNORECASE | re.DOTALL)
+
+# Only the body is built; <head> is skipped. Header, nav and footer stay whole inside it
+# so the decompose pass below can remove them with all their children
+CONTENT_STRAINER = SoupStrainer('body')
+
+def _build_article_session() -> requests.Session:
+    """Create the keep-alive session shared by every clean_article_text call"""
+    session = requests.Session()
+    session.headers.update({
+        'User-Agent': 'Mozilla/5.0 (compatible; VC-Thesis-Bot/1.0)',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.5',
+        'Accept-Encoding': DEFAULT_ACCEPT_ENCODING,
+        'Connection': 'keep-alive',
+    })
+    # Articles of one VC share a host; retries (with backoff) happen inside urllib3
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+_ARTICLE_SESSION = _build_article_session()
+
+# Cleaned article text is kept on disk with the page's validators; fresh entries are
+# served without a request, stale ones are revalidated with a conditional GET
+ARTICLE_CACHE_FILE = "data/article_cache.sqlite"
+ARTICLE_CACHE_TTL = 24 * 60 * 60
+
+_article_cache = None
+_article_cache_lock = threading.Lock()
+
+def _article_cache_db() -> sqlite3.Connection:
+    """Open the article cache on first use (callers hold _article_cache_lock)"""
+    global _article_cache
+    if _article_cache is None:
+        os.makedirs(os.path.dirname(ARTICLE_CACHE_FILE) or '.', exist_ok=True)
+        _article_cache = sqlite3.connect(ARTICLE_CACHE_FILE, check_same_thread=False)
+        _article_cache.execute(
+            "CREATE TABLE IF NOT EXISTS articles ("
+            "url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, text TEXT, fetched_at REAL)"
+        )
+    return _article_cache
+
+def _cached_article(url: str) -> Optional[Dict]:
+    """Look up a cached article, or None"""
+    try:
+        with _article_cache_lock:
+            row = _article_cache_db().execute(
+                "SELECT etag, last_modified, text, fetched_at FROM articles WHERE url = ?", (url,)
+            ).fetchone()
+    except sqlite3.Error as e:
+        logger.warning(f"Article cache unavailable: {e}")
+        return None
+    if row is None:
+        return None
+    return dict(zip(('etag', 'last_modified', 'text', 'fetched_at'), row))
+
+def _cache_article(url: str, etag: Optional[str], last_modified: Optional[str], text: str):
+    """Store (or refresh) a cached article"""
+    try:
+        with _article_cache_lock:
+            db = _article_cache_db()
+            db.execute(
+                "INSERT OR REPLACE INTO articles VALUES (?, ?, ?, ?, ?)",
+                (url, etag, last_modified, text, time.time())
+            )
+            db.commit()
+    except sqlite3.Error as e:
+        logger.warning(f"Could not cache {url}: {e}")
+
+def clean_article_text(url):
     """Extract and clean article content from URL with multiple strategies"""
+    cached = _cached_article(url)
+    if cached and time.time() - cached['fetched_at'] < ARTICLE_CACHE_TTL:
+        return cached['text']
+    
+    headers = {}
+    if cached and cached['etag']:
+        headers['If-None-Match'] = cached['etag']
+    if cached and cached['last_modified']:
+        headers['If-Modified-Since'] = cached['last_modified']
     
-    for attempt in range(max_retries):
-        try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (compatible; VC-Thesis-Bot/1.0)',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive',
-            }
-            
-            response = requests.get(url, timeout=15, headers=headers)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Remove unwanted elements
-            for element in soup(['script', 'style', 'nav', 'header', 'footer', 
-                               'aside', 'advertisement', '.ad', '.ads']):
-                element.decompose()
-            
-            # Try multiple content extraction strategies
-            content = extract_main_content(soup)
-            
-            if not content or len(content.strip()) < 50:
-                logger.warning(f"Insufficient content extracted from {url}")
-                return ""
-            
-            return clean_text(content)
-            
-        except requests.RequestException as e:
-            logger.warning(f"Attempt {attempt + 1} failed for {url}: {e}")
-            if attempt == max_retries - 1:
-                return ""
-        except Exception as e:
-            logger.error(f"Unexpected error extracting content from {url}: {e}")
+    try:
+        response = _ARTICLE_SESSION.get(url, timeout=15, headers=headers)
+        response.raise_for_status()
+        
+        # Unchanged since it was cached; no body was sent
+        if response.status_code == 304 and cached:
+            _cache_article(url, cached['etag'], cached['last_modified'], cached['text'])
+            return cached['text']
+        
+        # Raw bytes let lxml detect the encoding; only the body is built
+        soup = BeautifulSoup(response.content, 'lxml', parse_only=CONTENT_STRAINER)
+        
+        # Remove unwanted elements
+        for element in soup(['script', 'style', 'nav', 'header', 'footer', 
+                           'aside', 'advertisement', '.ad', '.ads']):
+            element.decompose()
+        
+        # Try multiple content extraction strategies
+        content = extract_main_content(soup)
+        
+        if not content or len(content.strip()) < 50:
+            logger.warning(f"Insufficient content extracted from {url}")
             return ""
+        
+        text = clean_text(content)
+        _cache_article(url, response.headers.get('ETag'), response.headers.get('Last-Modified'), text)
+        return text
+        
+    except requests.RequestException as e:
+        if cached:
+            logger.warning(f"Failed to fetch {url}, using cached copy: {e}")
+            return cached['text']
+        logger.warning(f"Failed to fetch {url}: {e}")
+        return ""
+    except Exception as e:
+        logger.error(f"Unexpected error extracting content from {url}: {e}")
+        return ""
 
-def extract_main_content(soup):
-    """Extract main content using multiple strategies"""
-    
-    # Strategy 1: Look for common article containers
-    article_selectors = [
+# Common article containers in priority order, compiled once instead of per page
+ARTICLE_SELECTORS = [
+    soupsieve.compile(selector) for selector in (
         'article',
         '.post-content',
-        '.entry-content', 
+        '.entry-content',
         '.content',
         '.post-body',
         '.article-content',
         'main',
         '.main-content',
         '[role="main"]'
-    ]
+    )
+]
+
+def _joined_text(elements) -> str:
+    """Join the non-empty stripped text of elements, one per line"""
+    texts = (element.get_text(strip=True) for element in elements)
+    return '\n'.join(text for text in texts if text)
+
+def extract_main_content(soup):
+    """Extract main content using multiple strategies"""
     
-    for selector in article_selectors:
-        content_div = soup.select_one(selector)
+    # Strategy 1: Look for common article containers
+    for selector in ARTICLE_SELECTORS:
+        content_div = selector.select_one(soup)
         if content_div:
             paragraphs = content_div.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
             if paragraphs:
-                text = '\n'.join(p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True))
+                text = _joined_text(paragraphs)
                 if len(text) > 100:  # If we got substantial content
                     return text
     
-    # Strategy 2: Look for the largest text container
-    all_divs = soup.find_all('div')
+    # Strategy 2: Look for the largest text container; one pass over the paragraphs
+    # credits each one's text to every enclosing div
+    text_lengths = Counter()
+    paragraph_counts = Counter()
+    for p in soup.find_all('p'):
+        text_length = len(p.get_text())
+        for parent in p.parents:
+            if parent.name == 'div':
+                text_lengths[id(parent)] += text_length
+                paragraph_counts[id(parent)] += 1
+    
     best_div = None
     max_text_length = 0
     
-    for div in all_divs:
-        paragraphs = div.find_all('p')
-        if len(paragraphs) >= 3:  # At least 3 paragraphs
-            text_length = len(' '.join(p.get_text() for p in paragraphs))
+    for div in soup.find_all('div'):
+        paragraph_count = paragraph_counts[id(div)]
+        if paragraph_count >= 3:  # At least 3 paragraphs
+            # Same measure as joining the paragraph texts with spaces
+            text_length = text_lengths[id(div)] + paragraph_count - 1
             if text_length > max_text_length:
                 max_text_length = text_length
                 best_div = div
     
     if best_div:
         paragraphs = best_div.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
-        text = '\n'.join(p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True))
+        text = _joined_text(paragraphs)
         if len(text) > 100:
             return text
     
     # Strategy 3: Fallback to all paragraphs
     paragraphs = soup.find_all('p')
-    return '\n'.join(p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True))
+    return _joined_text(paragraphs)
 
 def clean_text(text):
     """Clean extracted text"""
@@ -100,29 +295,16 @@ def clean_text(text):
         return ""
     
     # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text)
-    
-    # Remove common navigation/footer text
-    unwanted_patterns = [
-        r'Get in Touch.*',
-        r'Dark Mode.*',
-        r'Made with.*',
-        r'Copyright.*',
-        r'All rights reserved.*',
-        r'Follow us.*',
-        r'Subscribe.*',
-        r'Share this.*',
-        r'Contact us.*'
-    ]
+    text = _WHITESPACE_RE.sub(' ', text)
     
-    for pattern in unwanted_patterns:
-        text = re.sub(pattern, '', text, flags=re.IGNORECASE | re.DOTALL)
+    # Remove common navigation/footer text (and everything after it) in one scan
+    text = _UNWANTED_TEXT_RE.sub('', text)
     
     # Remove URLs
-    text = re.sub(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', text)
+    text = _URL_RE.sub('', text)
     
     # Clean up extra spaces again
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = _WHITESPACE_RE.sub(' ', text).strip()
     
     return text
 
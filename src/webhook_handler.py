@@ -1,18 +1,32 @@
 # New file: src/webhook_handler.py
 from flask import Flask, request, jsonify
 from enhanced_scraper import EnhancedMultiVCScraper
+from typing import Optional
 import os
+import threading
 
 app = Flask(__name__)
 
+# One scraper per process so its sessions, Notion client and caches outlive a request
+_SCRAPER: Optional[EnhancedMultiVCScraper] = None
+_SCRAPER_LOCK = threading.Lock()
+
+def _get_scraper() -> EnhancedMultiVCScraper:
+    """Create the shared scraper on first use"""
+    global _SCRAPER
+    with _SCRAPER_LOCK:
+        if _SCRAPER is None:
+            _SCRAPER = EnhancedMultiVCScraper(
+                notion_token=os.getenv('NOTION_TOKEN'),
+                database_id=os.getenv('NOTION_DATABASE_ID')
+            )
+        return _SCRAPER
+
 @app.route('/trigger-scan', methods=['POST'])
 def trigger_scan():
     """Webhook endpoint to trigger immediate scan"""
     try:
-        scraper = EnhancedMultiVCScraper(
-            notion_token=os.getenv('NOTION_TOKEN'),
-            database_id=os.getenv('NOTION_DATABASE_ID')
-        )
+        scraper = _get_scraper()
         
         # Quick scan for very recent articles
         articles = scraper.scrape_all_vcs(max_articles_per_vc=5)
@@ -35,7 +35,7 @@ def test_notion_integration():
         print(f"✅ Successfully created test article with page ID: {page_id}")
         
         # Test checking if article exists
-        content_hash = notion_db._generate_hash(test_article['content'])
+        content_hash = notion_db.content_hash(test_article['content'])
         exists = notion_db.check_article_exists(content_hash)
         print(f"✅ Article existence check: {exists}")
         